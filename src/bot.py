@@ -1,17 +1,19 @@
 import os
+import re
 import sys
 import signal
+import time
 import asyncio
+import itertools
+import threading
 import logging
-import discord
-from discord.ext import commands
-from github import Github
-from dotenv import load_dotenv
+from aiolimiter import AsyncLimiter
 
-from .db.database import setup_database, save_issue_link, health_check
+from .db.database import setup_database, get_issue_link, health_check, close_database, IssueLinkWriter
 
 # Load environment variables (only for local development)
 if os.path.exists('.env'):
+    from dotenv import load_dotenv
     load_dotenv()
 
 # Configure logging for container environments (structured logging to stdout)
@@ -22,16 +24,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_CSV_SEPARATOR = re.compile(r"\s*,\s*")
+
+
+def parse_csv(value):
+    """
+    Splits a comma-separated string into its non-empty, stripped items.
+    """
+    return [item for item in _CSV_SEPARATOR.split(value.strip()) if item] if value else []
+
+
 # Configuration from environment variables
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
+# Optional comma-separated token pool; requests are spread across the tokens
+# round-robin so each one contributes its own rate-limit bucket
+GITHUB_TOKENS = parse_csv(os.getenv('GITHUB_TOKENS'))
+if not GITHUB_TOKENS and GITHUB_TOKEN:
+    GITHUB_TOKENS = [GITHUB_TOKEN]
 GITHUB_REPO_OWNER = os.getenv('GITHUB_REPO_OWNER')
 GITHUB_REPO_NAME = os.getenv('GITHUB_REPO_NAME')
+GITHUB_REPO_FULL_NAME = f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}"
+
+# GitHub HTTP connection pool: keep connections alive across commands so
+# concurrent requests reuse TLS sessions instead of handshaking each time
+GITHUB_POOL_SIZE = 50
+
+# Client-side governor for GitHub calls: cap in-flight requests and pace
+# issue creation so bursts of /create-issue stay under the secondary limits
+GITHUB_MAX_CONCURRENCY = 8
+GITHUB_ISSUES_PER_MINUTE = 30
+GITHUB_RATE_LIMIT_RETRIES = 3
+GITHUB_MAX_RETRY_DELAY = 60
 
 # Validate required environment variables
 required_vars = {
     'DISCORD_TOKEN': DISCORD_TOKEN,
-    'GITHUB_TOKEN': GITHUB_TOKEN,
+    'GITHUB_TOKEN (or GITHUB_TOKENS)': GITHUB_TOKENS,
     'GITHUB_REPO_OWNER': GITHUB_REPO_OWNER,
     'GITHUB_REPO_NAME': GITHUB_REPO_NAME
 }
@@ -41,6 +70,10 @@ if missing_vars:
     logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
     sys.exit(1)
 
+# Heavy client libraries are only imported once the configuration is valid
+import discord
+from discord.ext import commands
+
 # Initialize Discord bot with intents
 intents = discord.Intents.default()
 intents.messages = True
@@ -50,40 +83,166 @@ intents.message_content = True
 bot = commands.Bot(command_prefix="!", intents=intents)
 tree = bot.tree
 
-# Initialize PyGithub client
-try:
-    g = Github(GITHUB_TOKEN)
-    repo = g.get_repo(f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}")
-    logger.info(f"Connected to GitHub repository: {GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}")
-except Exception as e:
-    logger.error(f"Failed to connect to GitHub repository: {e}")
-    sys.exit(1)
-
-# Global shutdown flag for graceful shutdown
-shutdown_flag = False
 
-
-class GracefulShutdown:
-    """Handles graceful shutdown for container environments."""
-    
-    def __init__(self, bot):
-        self.bot = bot
-        signal.signal(signal.SIGTERM, self._handle_sigterm)
-        signal.signal(signal.SIGINT, self._handle_sigint)
+def make_github(token, **kwargs):
+    """
+    Builds a PyGithub client for one token, with a sized connection pool and
+    transport-level retries of server errors on idempotent requests. Extra
+    keyword arguments (e.g. base_url) are passed on to Github.
     
-    def _handle_sigterm(self, signum, frame):
-        logger.info("Received SIGTERM, initiating graceful shutdown...")
-        asyncio.create_task(self._shutdown())
+    Rate limits (403/429) are deliberately not retried here: GithubRetry
+    would sleep for them in the worker thread, uncapped and while holding a
+    call_github() slot. They surface as GithubExceptions and call_github()
+    owns the backoff.
+    """
+    from github import Auth, Github
+    from urllib3.util.retry import Retry
     
-    def _handle_sigint(self, signum, frame):
-        logger.info("Received SIGINT, initiating graceful shutdown...")
-        asyncio.create_task(self._shutdown())
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[500, 502, 503, 504],
+        # Only idempotent methods: a 5xx can arrive after GitHub has already
+        # created the issue, and retrying the POST would create a duplicate
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        # Don't retry 429s (or sleep on Retry-After) at this layer
+        respect_retry_after_header=False,
+        # Hand the final error response to PyGithub so it raises GithubException
+        raise_on_status=False,
+    )
+    # lazy=True: get_repo() builds the object without a GET /repos round-trip
+    return Github(
+        auth=Auth.Token(token),
+        pool_size=GITHUB_POOL_SIZE,
+        retry=retry,
+        lazy=True,
+        **kwargs
+    )
+
+
+# Initialize one PyGithub client per token once at startup. Commands only
+# issue requests through them from worker threads and never mutate them.
+# No request is made here: the clients are lazy, and the repository is
+# validated by /health and by the first issue created in it.
+github_clients = [make_github(token) for token in GITHUB_TOKENS]
+github_repos = [client.get_repo(GITHUB_REPO_FULL_NAME) for client in github_clients]
+
+# /health probes its own Repository object: update() rewrites the object's
+# attributes in place, which must never happen to the repos commands share
+health_repo = github_clients[0].get_repo(GITHUB_REPO_FULL_NAME)
+_health_repo_lock = threading.Lock()
+logger.info(
+    f"Configured GitHub repository: {GITHUB_REPO_FULL_NAME} "
+    f"({len(github_clients)} token(s))"
+)
+
+# Created inside the running loop (see github_semaphore()); on Python 3.9 a
+# Semaphore built at import time binds to a different loop than the bot's
+_github_semaphore = None
+_github_semaphore_loop = None
+
+# Secondary rate limits apply per token, so each token gets its own limiter
+_github_pool = itertools.cycle([
+    (pooled_repo, AsyncLimiter(GITHUB_ISSUES_PER_MINUTE, 60))
+    for pooled_repo in github_repos
+])
+
+
+def next_github():
+    """
+    Returns the next (repo, issue limiter) pair from the token pool.
+    """
+    return next(_github_pool)
+
+
+# Batches issue link saves from concurrent commands into one transaction
+link_writer = IssueLinkWriter()
+
+
+# Strong references to scheduled shutdown tasks; the event loop only keeps
+# weak ones, so an unreferenced task could be garbage-collected mid-shutdown
+_shutdown_tasks = set()
+
+
+def _schedule_shutdown(loop, sig):
+    """
+    Signal handler that schedules shutdown() on the event loop.
+    """
+    task = loop.create_task(shutdown(sig))
+    _shutdown_tasks.add(task)
+    task.add_done_callback(_shutdown_tasks.discard)
+
+
+async def shutdown(sig):
+    """
+    Closes the Discord connection in response to a termination signal.
+    Scheduled on the event loop by the handlers registered in main().
+    """
+    logger.info(f"Received {sig.name}, initiating graceful shutdown...")
+    logger.info("Closing Discord bot connection...")
+    await bot.close()
+
+
+def probe_repository():
+    """
+    Conditional GET of the configured repository for /health. Raises if it
+    doesn't exist or the token can't reach it; unchanged responses are 304s
+    that use no quota.
+    """
+    with _health_repo_lock:
+        return health_repo.update()
+
+
+def github_semaphore():
+    """
+    Returns the semaphore capping in-flight GitHub calls on the running loop.
+    """
+    global _github_semaphore, _github_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _github_semaphore_loop is not loop:
+        _github_semaphore = asyncio.Semaphore(GITHUB_MAX_CONCURRENCY)
+        _github_semaphore_loop = loop
+    return _github_semaphore
+
+
+def _rate_limit_delay(error):
+    """
+    Returns how many seconds GitHub asked us to wait before retrying.
+    """
+    headers = {key.lower(): value for key, value in (error.headers or {}).items()}
+    if headers.get('retry-after'):
+        return float(headers['retry-after'])
+    if headers.get('x-ratelimit-reset'):
+        return max(0.0, float(headers['x-ratelimit-reset']) - time.time())
+    return float(GITHUB_MAX_RETRY_DELAY)
+
+
+async def call_github(func, *args, limiter=None, **kwargs):
+    """
+    Runs a blocking PyGithub call in a worker thread under the client-side
+    governor, waiting out and retrying GitHub rate-limit responses. This is
+    the only place rate limits are retried (see make_github).
+    """
+    from github import GithubException, RateLimitExceededException
     
-    async def _shutdown(self):
-        global shutdown_flag
-        shutdown_flag = True
-        logger.info("Closing Discord bot connection...")
-        await self.bot.close()
+    for attempt in range(GITHUB_RATE_LIMIT_RETRIES + 1):
+        try:
+            # Wait for the pacing limiter before taking a concurrency slot, so
+            # paced calls don't hold slots that unpaced calls (e.g. /health) need
+            if limiter is not None:
+                await limiter.acquire()
+            async with github_semaphore():
+                return await asyncio.to_thread(func, *args, **kwargs)
+        except GithubException as e:
+            # PyGithub only maps rate-limited 403s to RateLimitExceededException;
+            # a 429 surfaces as a plain GithubException
+            if not isinstance(e, RateLimitExceededException) and e.status != 429:
+                raise
+            delay = _rate_limit_delay(e)
+            if attempt == GITHUB_RATE_LIMIT_RETRIES or delay > GITHUB_MAX_RETRY_DELAY:
+                raise
+            logger.warning(f"GitHub rate limit hit, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
 
 
 @bot.event
@@ -108,6 +267,15 @@ async def on_ready():
         sys.exit(1)
 
 
+async def defer_ephemeral(interaction: discord.Interaction) -> bool:
+    """
+    App command check that defers the response before any other check runs,
+    so the command and its error handler can always reply via followup.
+    """
+    await interaction.response.defer(ephemeral=True)
+    return True
+
+
 @tree.command(name="create-issue", description="Create a GitHub issue from a Discord message.")
 @discord.app_commands.describe(
     message_id="The ID of the Discord message to use for the issue body.",
@@ -116,13 +284,13 @@ async def on_ready():
     assignees="A comma-separated list of GitHub usernames to assign (e.g., 'user1,user2')."
 )
 @discord.app_commands.checks.has_permissions(administrator=True)
+@discord.app_commands.check(defer_ephemeral)  # Listed last so it runs first
 async def create_issue(interaction: discord.Interaction, message_id: str, title: str, labels: str = None, assignees: str = None):
     """
     Slash command to create a GitHub issue from a Discord message.
     Enhanced with better error handling and logging for container environments.
+    The response has already been deferred by the defer_ephemeral check.
     """
-    await interaction.response.defer(ephemeral=True)
-    
     try:
         logger.info(f"Creating issue request from user {interaction.user.id} for message {message_id}")
         
@@ -136,34 +304,43 @@ async def create_issue(interaction: discord.Interaction, message_id: str, title:
             await interaction.followup.send(error_msg, ephemeral=True)
             return
         
-        # Prepare labels and assignees
-        issue_labels = ["user-reported"]
-        if labels:
-            issue_labels.extend([label.strip() for label in labels.split(',') if label.strip()])
+        # Skip the GitHub call entirely if this message already has an issue
+        existing_link = await asyncio.to_thread(get_issue_link, message.id)
+        if existing_link:
+            logger.info(f"Issue already exists for message {message_id}: #{existing_link[1]}")
+            await interaction.followup.send(
+                f"ℹ️ A GitHub issue already exists for this message: {existing_link[0]}",
+                ephemeral=True
+            )
+            return
         
-        issue_assignees = []
-        if assignees:
-            issue_assignees = [assignee.strip() for assignee in assignees.split(',') if assignee.strip()]
+        # Prepare labels and assignees
+        issue_labels = ["user-reported"] + parse_csv(labels)
+        issue_assignees = parse_csv(assignees)
         
         # Create issue body with Discord context
-        issue_body = (
+        body_parts = [
             f"**Reported by:** {message.author.mention} ({message.author.display_name})\n"
             f"**Discord Server:** {interaction.guild.name if interaction.guild else 'DM'}\n"
-            f"**Channel:** {channel.name if hasattr(channel, 'name') else 'DM'}\n"
+            f"**Channel:** {getattr(channel, 'name', 'DM')}\n"
             f"**Link to Discord message:** {message.jump_url}\n"
             f"**Message created:** {message.created_at.strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
             f"**Original message content:**\n{message.content if message.content else '*No text content*'}"
-        )
+        ]
         
         # Add attachments info if present
         if message.attachments:
-            issue_body += f"\n\n**Attachments ({len(message.attachments)}):**\n"
-            for attachment in message.attachments:
-                issue_body += f"- [{attachment.filename}]({attachment.url})\n"
+            body_parts.append(f"\n\n**Attachments ({len(message.attachments)}):**\n")
+            body_parts.extend(f"- [{attachment.filename}]({attachment.url})\n" for attachment in message.attachments)
+        
+        issue_body = "".join(body_parts)
         
         # Create the GitHub issue
         try:
-            new_issue = repo.create_issue(
+            issue_repo, issue_limiter = next_github()
+            new_issue = await call_github(
+                issue_repo.create_issue,
+                limiter=issue_limiter,
                 title=title,
                 body=issue_body,
                 labels=issue_labels,
@@ -171,7 +348,7 @@ async def create_issue(interaction: discord.Interaction, message_id: str, title:
             )
             
             # Save the link to the database
-            save_issue_link(message.id, new_issue.html_url, new_issue.number)
+            await link_writer.save(message.id, new_issue.html_url, new_issue.number)
             
             success_msg = f"✅ Successfully created GitHub issue: {new_issue.html_url}"
             logger.info(f"Issue created successfully: #{new_issue.number} for message {message_id}")
@@ -200,12 +377,10 @@ async def on_create_issue_error(interaction: discord.Interaction, error: discord
         error_msg = f"❌ Command error: {str(error)}"
         logger.error(f"Command error: {error}")
     
-    # Handle both deferred and non-deferred interactions
+    # defer_ephemeral runs before every other check, so the interaction is
+    # always deferred by the time an error reaches this handler
     try:
-        if interaction.response.is_done():
-            await interaction.followup.send(error_msg, ephemeral=True)
-        else:
-            await interaction.response.send_message(error_msg, ephemeral=True)
+        await interaction.followup.send(error_msg, ephemeral=True)
     except Exception as e:
         logger.error(f"Failed to send error message: {e}")
 
@@ -219,23 +394,29 @@ async def health_command(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
     
     try:
-        # Check database health
-        db_healthy = health_check()
-        
-        # Check GitHub API connection
-        try:
-            repo.get_contents("README.md")  # Simple API test
-            github_healthy = True
-        except Exception:
-            github_healthy = False
+        # Check database health, GitHub API connection and repository access concurrently
+        db_result, repo_result, *token_results = await asyncio.gather(
+            asyncio.to_thread(health_check),
+            # Confirms the repository exists and the token can reach it
+            call_github(probe_repository),
+            # /rate_limit confirms each pooled token works without using up any quota
+            *(call_github(client.get_rate_limit) for client in github_clients),
+            return_exceptions=True
+        )
+        db_healthy = db_result is True
+        repo_healthy = not isinstance(repo_result, Exception)
+        working_tokens = sum(not isinstance(result, Exception) for result in token_results)
+        github_healthy = working_tokens == len(token_results)
         
-        status = "🟢 Healthy" if db_healthy and github_healthy else "🔴 Unhealthy"
+        status = "🟢 Healthy" if db_healthy and github_healthy and repo_healthy else "🔴 Unhealthy"
         details = (
             f"**Bot Health Status:** {status}\n"
             f"**Database:** {'✅ Connected' if db_healthy else '❌ Error'}\n"
-            f"**GitHub API:** {'✅ Connected' if github_healthy else '❌ Error'}\n"
+            f"**GitHub API:** {'✅ Connected' if github_healthy else '❌ Error'} "
+            f"({working_tokens}/{len(token_results)} tokens working)\n"
             f"**Bot User:** {bot.user.name}#{bot.user.discriminator}\n"
-            f"**Repository:** {GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}"
+            f"**Repository:** {GITHUB_REPO_FULL_NAME} "
+            f"{'✅ Accessible' if repo_healthy else '❌ Not found or no access'}"
         )
         
         await interaction.followup.send(details, ephemeral=True)
@@ -249,8 +430,15 @@ async def main():
     """
     Main function to run the bot with graceful shutdown handling.
     """
-    # Set up graceful shutdown
-    shutdown_handler = GracefulShutdown(bot)
+    # Set up graceful shutdown; handlers run on the loop thread, so they can
+    # schedule the shutdown coroutine directly
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, _schedule_shutdown, loop, sig)
+        except NotImplementedError:
+            # Not supported by Windows event loops; Ctrl+C still raises KeyboardInterrupt
+            logger.warning(f"Signal handler for {sig.name} not supported on this platform")
     
     try:
         logger.info("Starting Discord bot...")
@@ -261,12 +449,19 @@ async def main():
     finally:
         if not bot.is_closed():
             await bot.close()
+        await link_writer.close()
+        close_database()
         logger.info("Bot shutdown complete")
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if sys.platform != "win32":
+            # libuv-based event loop: faster socket handling for the gateway and GitHub calls
+            import uvloop
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
@@ -1,6 +1,9 @@
 import sqlite3
 import os
+import asyncio
 import logging
+import threading
+import functools
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -8,43 +11,106 @@ logger = logging.getLogger(__name__)
 # Container-friendly database path configuration
 DATABASE_PATH = os.getenv('DATABASE_PATH', '/app/data/bot_data.db')
 
+# Shared connection, opened once and reused by every query. Commands run
+# queries from worker threads, so access is serialized with a lock.
+_conn = None
+_conn_lock = threading.Lock()
+
+# WAL keeps readers (e.g. health checks) from blocking on writes and lets
+# commits append to the log instead of fsyncing the database every time
+_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+"""
+
+# Statement text is kept constant so sqlite3's per-connection statement
+# cache compiles each query only once
+_STATEMENTS = {
+    "insert": "INSERT INTO issue_links (discord_message_id, github_issue_url, github_issue_id) VALUES (?, ?, ?)",
+    "select": "SELECT github_issue_url, github_issue_id FROM issue_links WHERE discord_message_id = ?",
+    "ping": "SELECT 1",
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _prepare_database_path(database_path):
+    """
+    Resolves the database path and creates its directory, once per path.
+    """
+    db_path = Path(database_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    return str(db_path)
+
 
 def get_database_path():
     """
     Returns the database path, ensuring the directory exists.
     Container-optimized to handle volume mounts.
     """
-    db_path = Path(DATABASE_PATH)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    return str(db_path)
+    return _prepare_database_path(DATABASE_PATH)
+
+
+def _open_connection(db_path):
+    """
+    Opens a connection in autocommit mode that may be shared across threads.
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    conn.executescript(_PRAGMAS)
+    return conn
+
+
+def get_connection():
+    """
+    Returns the shared database connection, opening it on first use.
+    """
+    global _conn
+    if _conn is None:
+        _conn = _open_connection(get_database_path())
+    return _conn
+
+
+def close_database():
+    """
+    Closes the shared database connection, if one is open.
+    """
+    global _conn
+    with _conn_lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
 
 
 def setup_database():
     """
     Creates the SQLite database and the issue_links table if they don't exist.
-    Container-optimized with proper error handling and logging.
+    (Re)opens the shared connection used by the other database functions.
     """
+    global _conn
     db_path = get_database_path()
     logger.info(f"Setting up database at: {db_path}")
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS issue_links (
-                discord_message_id INTEGER PRIMARY KEY,
-                github_issue_url TEXT NOT NULL,
-                github_issue_id INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        conn.commit()
+        # Close and reopen under one hold of the lock, so no worker thread can
+        # open (and leak) a connection in between
+        with _conn_lock:
+            if _conn is not None:
+                _conn.close()
+                _conn = None
+            _conn = _open_connection(db_path)
+            _conn.execute("""
+                CREATE TABLE IF NOT EXISTS issue_links (
+                    discord_message_id INTEGER PRIMARY KEY,
+                    github_issue_url TEXT NOT NULL,
+                    github_issue_id INTEGER NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
         logger.info("Database setup completed successfully")
     except sqlite3.Error as e:
         logger.error(f"Database setup error: {e}")
         raise
-    finally:
-        conn.close()
 
 
 def save_issue_link(discord_message_id, github_issue_url, github_issue_id):
@@ -52,16 +118,12 @@ def save_issue_link(discord_message_id, github_issue_url, github_issue_id):
     Saves the link between a Discord message and a GitHub issue to the database.
     Enhanced with better error handling and logging for container environments.
     """
-    db_path = get_database_path()
-    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO issue_links (discord_message_id, github_issue_url, github_issue_id) VALUES (?, ?, ?)",
-            (discord_message_id, github_issue_url, github_issue_id)
-        )
-        conn.commit()
+        with _conn_lock:
+            get_connection().execute(
+                _STATEMENTS["insert"],
+                (discord_message_id, github_issue_url, github_issue_id)
+            )
         logger.info(f"Saved issue link: Discord message {discord_message_id} -> GitHub issue #{github_issue_id}")
     except sqlite3.IntegrityError as e:
         logger.warning(f"Issue link already exists for Discord message {discord_message_id}: {e}")
@@ -69,30 +131,144 @@ def save_issue_link(discord_message_id, github_issue_url, github_issue_id):
     except sqlite3.Error as e:
         logger.error(f"Database error saving issue link: {e}")
         raise
-    finally:
-        conn.close()
+
+
+def save_issue_links(issue_links):
+    """
+    Saves several (discord_message_id, github_issue_url, github_issue_id) links
+    in a single transaction. Nothing is saved if any of them fails.
+    """
+    try:
+        with _conn_lock:
+            conn = get_connection()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(_STATEMENTS["insert"], issue_links)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        for discord_message_id, _, github_issue_id in issue_links:
+            logger.info(f"Saved issue link: Discord message {discord_message_id} -> GitHub issue #{github_issue_id}")
+        logger.info(f"Saved {len(issue_links)} issue link(s) in one transaction")
+    except sqlite3.Error as e:
+        logger.error(f"Database error saving issue links: {e}")
+        raise
+
+
+class IssueLinkWriter:
+    """
+    Background writer that coalesces issue link saves arriving within a short
+    window into one transaction, so a burst of commands costs a single commit.
+    """
+    
+    def __init__(self, batch_window=0.05):
+        self.batch_window = batch_window
+        self._queue = None
+        self._task = None
+    
+    async def save(self, discord_message_id, github_issue_url, github_issue_id):
+        """
+        Queues an issue link and waits until its batch has been committed.
+        Raises the same errors as save_issue_link.
+        """
+        self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((discord_message_id, github_issue_url, github_issue_id), future))
+        return await future
+    
+    async def close(self):
+        """
+        Flushes any queued links and stops the background writer.
+        """
+        task, queue = self._task, self._queue
+        if task is None:
+            return
+        # Detach first: a save() arriving while we flush starts a fresh writer
+        # instead of queueing behind the stop sentinel
+        self._task = None
+        self._queue = None
+        if not task.done():
+            await queue.put(None)
+            await task
+    
+    def _ensure_running(self):
+        """
+        Starts the background writer, or restarts it if it has ended (e.g. it
+        was cancelled during loop teardown). Items left in the old queue are
+        carried over so their callers are not left waiting.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        old_queue = self._queue
+        self._queue = asyncio.Queue()
+        while old_queue is not None and not old_queue.empty():
+            item = old_queue.get_nowait()
+            if item is not None:
+                self._queue.put_nowait(item)
+        self._task = asyncio.create_task(self._run(self._queue))
+    
+    async def _run(self, queue):
+        while True:
+            batch = [await queue.get()]
+            try:
+                await asyncio.sleep(self.batch_window)
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                
+                stopping = None in batch
+                batch = [item for item in batch if item is not None]
+                if batch:
+                    await self._write(batch)
+            except asyncio.CancelledError:
+                # Don't leave callers of an in-flight batch waiting forever
+                for item in batch:
+                    if item is not None and not item[1].done():
+                        item[1].cancel()
+                raise
+            if stopping:
+                return
+    
+    async def _write(self, batch):
+        try:
+            await asyncio.to_thread(save_issue_links, [row for row, _ in batch])
+            results = [None] * len(batch)
+        except sqlite3.IntegrityError:
+            # One duplicate rolls back the whole batch; retry row by row so
+            # only the offending caller sees the error
+            results = []
+            for row, _ in batch:
+                try:
+                    await asyncio.to_thread(save_issue_link, *row)
+                    results.append(None)
+                except Exception as e:
+                    results.append(e)
+        except Exception as e:
+            results = [e] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result is None:
+                future.set_result(None)
+            else:
+                future.set_exception(result)
 
 
 def get_issue_link(discord_message_id):
     """
     Retrieves the GitHub issue link for a given Discord message ID.
     """
-    db_path = get_database_path()
-    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT github_issue_url, github_issue_id FROM issue_links WHERE discord_message_id = ?",
-            (discord_message_id,)
-        )
-        result = cursor.fetchone()
+        with _conn_lock:
+            result = get_connection().execute(
+                _STATEMENTS["select"],
+                (discord_message_id,)
+            ).fetchone()
         return result if result else None
     except sqlite3.Error as e:
         logger.error(f"Database error retrieving issue link: {e}")
         raise
-    finally:
-        conn.close()
 
 
 def health_check():
@@ -100,12 +276,9 @@ def health_check():
     Performs a database health check for container monitoring.
     """
     try:
-        db_path = get_database_path()
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        conn.close()
+        with _conn_lock:
+            get_connection().execute(_STATEMENTS["ping"])
         return True
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
-        return False
\ No newline at end of file
+        return False
@@ -3,7 +3,8 @@ import asyncio
 import tempfile
 import os
 from unittest.mock import Mock, patch, AsyncMock
-from src.db.database import setup_database, save_issue_link, get_issue_link, health_check
+import sqlite3
+from src.db.database import setup_database, save_issue_link, save_issue_links, get_issue_link, health_check, close_database, get_connection, IssueLinkWriter
 
 
 class TestDatabase:
@@ -21,6 +22,7 @@ class TestDatabase:
     
     def teardown_method(self):
         """Clean up test database."""
+        close_database()
         self.patcher.stop()
         if os.path.exists(self.temp_db_path):
             os.unlink(self.temp_db_path)
@@ -78,9 +80,122 @@ class TestDatabase:
         
         # Health check should pass with valid database
         assert health_check() is True
+    
+    def test_connection_is_reused(self):
+        """Test that queries share the connection opened by setup."""
+        setup_database()
+        conn = get_connection()
+        
+        save_issue_link(123456789, "https://github.com/owner/repo/issues/1", 1)
+        get_issue_link(123456789)
+        health_check()
+        
+        assert get_connection() is conn
+    
+    @pytest.mark.asyncio
+    async def test_issue_link_writer_batches_saves(self):
+        """Test that concurrent writer saves are committed in one transaction."""
+        setup_database()
+        writer = IssueLinkWriter()
+        
+        with patch('src.db.database.save_issue_links', wraps=save_issue_links) as mock_save_links:
+            await asyncio.gather(*(
+                writer.save(message_id, f"https://github.com/owner/repo/issues/{message_id}", message_id)
+                for message_id in (1, 2, 3)
+            ))
+            await writer.close()
+        
+        mock_save_links.assert_called_once()
+        assert get_issue_link(2) == ("https://github.com/owner/repo/issues/2", 2)
+    
+    @pytest.mark.asyncio
+    async def test_issue_link_writer_isolates_duplicates(self):
+        """Test that a duplicate in a batch only fails its own save."""
+        setup_database()
+        save_issue_link(1, "https://github.com/owner/repo/issues/1", 1)
+        writer = IssueLinkWriter()
+        
+        results = await asyncio.gather(
+            writer.save(1, "https://github.com/owner/repo/issues/1", 1),
+            writer.save(2, "https://github.com/owner/repo/issues/2", 2),
+            return_exceptions=True
+        )
+        await writer.close()
+        
+        assert isinstance(results[0], sqlite3.IntegrityError)
+        assert results[1] is None
+        assert get_issue_link(2) == ("https://github.com/owner/repo/issues/2", 2)
+    
+    def test_setup_database_replaces_connection(self):
+        """Test that re-running setup (e.g. on reconnect) swaps in a fresh connection."""
+        setup_database()
+        old_conn = get_connection()
+        
+        setup_database()
+        
+        assert get_connection() is not old_conn
+        with pytest.raises(sqlite3.ProgrammingError):
+            old_conn.execute("SELECT 1")
+    
+    @pytest.mark.asyncio
+    async def test_issue_link_writer_restarts_after_task_ends(self):
+        """Test that saving after the writer task died doesn't hang."""
+        setup_database()
+        writer = IssueLinkWriter()
+        await writer.save(1, "https://github.com/owner/repo/issues/1", 1)
+        
+        writer._task.cancel()
+        await asyncio.gather(writer._task, return_exceptions=True)
+        
+        await asyncio.wait_for(writer.save(2, "https://github.com/owner/repo/issues/2", 2), timeout=1)
+        await writer.close()
+        
+        assert get_issue_link(2) == ("https://github.com/owner/repo/issues/2", 2)
+    
+    @pytest.mark.asyncio
+    async def test_issue_link_writer_save_during_close(self):
+        """Test that a save racing with close() is still committed."""
+        setup_database()
+        writer = IssueLinkWriter()
+        await writer.save(1, "https://github.com/owner/repo/issues/1", 1)
+        
+        close_task = asyncio.create_task(writer.close())
+        await asyncio.sleep(0)
+        await asyncio.wait_for(writer.save(2, "https://github.com/owner/repo/issues/2", 2), timeout=1)
+        await close_task
+        await writer.close()
+        
+        assert get_issue_link(2) == ("https://github.com/owner/repo/issues/2", 2)
+    
+    @pytest.mark.asyncio
+    async def test_issue_link_writer_logs_each_link(self, caplog):
+        """Test that batched saves still log every message -> issue link."""
+        setup_database()
+        writer = IssueLinkWriter()
+        
+        with caplog.at_level("INFO", logger="src.db.database"):
+            await asyncio.gather(
+                writer.save(1, "https://github.com/owner/repo/issues/1", 1),
+                writer.save(2, "https://github.com/owner/repo/issues/2", 2),
+            )
+            await writer.close()
+        
+        assert "Saved issue link: Discord message 1 -> GitHub issue #1" in caplog.text
+        assert "Saved issue link: Discord message 2 -> GitHub issue #2" in caplog.text
+    
+    def test_database_uses_wal_journal(self):
+        """Test that the shared connection runs in WAL mode."""
+        setup_database()
+        
+        mode = get_connection().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
 
 
 import importlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 
 class TestBotCommands:
@@ -95,6 +210,20 @@ class TestBotCommands:
         monkeypatch.setenv("GITHUB_REPO_NAME", "test_repo")
         monkeypatch.setattr("github.Github", Mock())
     
+    @pytest.fixture
+    def mock_repo(self, mock_env_vars):
+        """Serve a mock repository (with its own rate limiter) from the token pool."""
+        from aiolimiter import AsyncLimiter
+        repo = Mock()
+        with patch('src.bot.next_github', return_value=(repo, AsyncLimiter(30, 60))):
+            yield repo
+    
+    @pytest.fixture(autouse=True)
+    def no_existing_issue_link(self, mock_env_vars):
+        """Treat every message as not yet linked to an issue."""
+        with patch('src.bot.get_issue_link', return_value=None):
+            yield
+    
     @pytest.fixture
     def mock_interaction(self):
         """Create a mock Discord interaction."""
@@ -128,10 +257,9 @@ class TestBotCommands:
         return message
     
     @pytest.mark.asyncio
-    async def test_create_issue_command_success(self, mock_interaction, mock_message):
+    async def test_create_issue_command_success(self, mock_interaction, mock_message, mock_repo):
         """Test successful issue creation."""
-        with patch('src.bot.repo') as mock_repo, \
-             patch('src.bot.save_issue_link') as mock_save_link:
+        with patch('src.bot.link_writer.save', new_callable=AsyncMock) as mock_save_link:
             
             # Mock GitHub issue creation
             mock_issue = Mock()
@@ -154,33 +282,428 @@ class TestBotCommands:
             )
             
             # Verify interactions
-            mock_interaction.response.defer.assert_called_once_with(ephemeral=True)
             mock_interaction.channel.fetch_message.assert_called_once_with(987654321)
             mock_repo.create_issue.assert_called_once()
+            assert mock_repo.create_issue.call_args.kwargs["labels"] == ["user-reported", "bug", "feature"]
+            assert mock_repo.create_issue.call_args.kwargs["assignees"] == ["user1", "user2"]
             mock_save_link.assert_called_once_with(987654321, mock_issue.html_url, mock_issue.number)
             mock_interaction.followup.send.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_create_issue_invalid_message_id(self, mock_interaction):
-        """Test issue creation with invalid message ID."""
-        with patch('src.bot.repo'):
-            # Mock message not found
-            mock_interaction.channel.fetch_message.side_effect = ValueError("Invalid message ID")
+    async def test_create_issue_lists_attachments(self, mock_interaction, mock_message, mock_repo):
+        """Test that message attachments are listed in the issue body."""
+        with patch('src.bot.link_writer.save', new_callable=AsyncMock):
+            
+            attachments = []
+            for i in range(3):
+                attachment = Mock()
+                attachment.filename = f"file{i}.png"
+                attachment.url = f"https://cdn.discordapp.com/file{i}.png"
+                attachments.append(attachment)
+            mock_message.attachments = attachments
+            mock_interaction.channel.fetch_message.return_value = mock_message
             
             from src.bot import create_issue
             
-            await create_issue.callback(
-                mock_interaction,
-                "invalid",
-                "Test Issue"
+            await create_issue.callback(mock_interaction, "987654321", "Test Issue")
+            
+            body = mock_repo.create_issue.call_args.kwargs["body"]
+            assert "**Original message content:**\nTest message content" in body
+            assert body.endswith(
+                "\n\n**Attachments (3):**\n"
+                "- [file0.png](https://cdn.discordapp.com/file0.png)\n"
+                "- [file1.png](https://cdn.discordapp.com/file1.png)\n"
+                "- [file2.png](https://cdn.discordapp.com/file2.png)\n"
             )
+    
+    @pytest.mark.asyncio
+    async def test_create_issue_does_not_retry_other_github_errors(self, mock_interaction, mock_message, mock_repo):
+        """Test that non rate-limit GitHub errors are reported without retrying."""
+        from github import GithubException
+        
+        with patch('src.bot.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            mock_repo.create_issue.side_effect = GithubException(404, {"message": "Not Found"}, {})
+            mock_interaction.channel.fetch_message.return_value = mock_message
+            
+            from src.bot import create_issue
+            
+            await create_issue.callback(mock_interaction, "987654321", "Test Issue")
+            
+            mock_sleep.assert_not_called()
+            assert mock_repo.create_issue.call_count == 1
+            assert "Failed to create GitHub issue" in mock_interaction.followup.send.call_args.args[0]
+    
+    @pytest.mark.asyncio
+    async def test_call_github_paces_before_taking_a_slot(self, mock_env_vars):
+        """Test that the limiter is awaited before a concurrency slot is held."""
+        from src.bot import call_github, github_semaphore, GITHUB_MAX_CONCURRENCY
+        
+        free_slots = []
+        limiter = Mock()
+        limiter.acquire = AsyncMock(side_effect=lambda: free_slots.append(github_semaphore()._value))
+        
+        assert await call_github(lambda: "ok", limiter=limiter) == "ok"
+        assert free_slots == [GITHUB_MAX_CONCURRENCY]
+    
+    @pytest.mark.asyncio
+    async def test_create_issue_skips_already_linked_message(self, mock_interaction, mock_message, mock_repo):
+        """Test that a message with an existing issue doesn't create another."""
+        existing_url = "https://github.com/owner/repo/issues/7"
+        
+        with patch('src.bot.get_issue_link', return_value=(existing_url, 7)) as mock_get_link, \
+             patch('src.bot.link_writer.save', new_callable=AsyncMock) as mock_save_link:
+            mock_interaction.channel.fetch_message.return_value = mock_message
+            
+            from src.bot import create_issue
             
-            # Verify error handling
-            mock_interaction.response.defer.assert_called_once_with(ephemeral=True)
+            await create_issue.callback(mock_interaction, "987654321", "Test Issue")
+            
+            mock_get_link.assert_called_once_with(987654321)
+            mock_repo.create_issue.assert_not_called()
+            mock_save_link.assert_not_called()
             mock_interaction.followup.send.assert_called_once_with(
-                "Error: Invalid message ID or message not found.", 
+                f"ℹ️ A GitHub issue already exists for this message: {existing_url}",
                 ephemeral=True
             )
+    
+    @pytest.mark.asyncio
+    async def test_create_issue_invalid_message_id(self, mock_interaction, mock_repo):
+        """Test issue creation with invalid message ID."""
+        # Mock message not found
+        mock_interaction.channel.fetch_message.side_effect = ValueError("Invalid message ID")
+        
+        from src.bot import create_issue
+        
+        await create_issue.callback(
+            mock_interaction,
+            "invalid",
+            "Test Issue"
+        )
+        
+        # Verify error handling
+        mock_interaction.followup.send.assert_called_once_with(
+            "Error: Invalid message ID or message not found.", 
+            ephemeral=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_issue_defers_before_permission_check(self, mock_interaction):
+        """Test that the response is deferred before the permission check runs."""
+        from src.bot import create_issue, defer_ephemeral
+        
+        assert create_issue.checks[0] is defer_ephemeral
+        assert len(create_issue.checks) == 2
+        
+        assert await defer_ephemeral(mock_interaction) is True
+        mock_interaction.response.defer.assert_called_once_with(ephemeral=True)
+    
+    @pytest.mark.asyncio
+    async def test_create_issue_error_uses_followup(self, mock_interaction):
+        """Test that command errors are reported through the followup."""
+        import discord
+        from src.bot import on_create_issue_error
+        
+        error = discord.app_commands.MissingPermissions(["administrator"])
+        await on_create_issue_error(mock_interaction, error)
+        
+        mock_interaction.followup.send.assert_called_once_with(
+            "❌ You do not have administrator permissions to use this command.",
+            ephemeral=True
+        )
+    
+    def test_github_client_never_retries_post(self):
+        """Test that transport-level retries never resend issue creation."""
+        from src.bot import make_github
+        
+        with patch('github.Github') as mock_github:
+            make_github("test_token")
+        
+        retry = mock_github.call_args.kwargs["retry"]
+        assert "POST" not in retry.allowed_methods
+        assert "GET" in retry.allowed_methods
+    
+    def test_parse_csv(self):
+        """Test comma-separated option parsing."""
+        from src.bot import parse_csv
+        
+        assert parse_csv(" bug , feature,,ui ,") == ["bug", "feature", "ui"]
+        assert parse_csv("  ") == []
+        assert parse_csv(None) == []
+    
+    @pytest.mark.asyncio
+    async def test_health_command_reports_healthy(self, mock_interaction):
+        """Test health command reports both database and GitHub as healthy."""
+        mock_github = Mock()
+        with patch('src.bot.github_clients', [mock_github]), \
+             patch('src.bot.health_check', return_value=True), \
+             patch('src.bot.bot') as mock_bot:
+            mock_bot.user.name = "TestBot"
+            mock_bot.user.discriminator = "0001"
+
+            from src.bot import health_command
+
+            await health_command.callback(mock_interaction)
+
+            mock_github.get_rate_limit.assert_called_once_with()
+            details = mock_interaction.followup.send.call_args.args[0]
+            assert "🟢 Healthy" in details
+            assert "**Repository:** test_owner/test_repo ✅ Accessible" in details
+    
+    @pytest.mark.asyncio
+    async def test_health_command_reports_github_failure(self, mock_interaction):
+        """Test health command still reports the database when GitHub fails."""
+        mock_github = Mock()
+        with patch('src.bot.github_clients', [mock_github]), \
+             patch('src.bot.health_check', return_value=True), \
+             patch('src.bot.bot') as mock_bot:
+            mock_bot.user.name = "TestBot"
+            mock_bot.user.discriminator = "0001"
+            mock_github.get_rate_limit.side_effect = Exception("Bad credentials")
+            
+            from src.bot import health_command
+            
+            await health_command.callback(mock_interaction)
+            
+            details = mock_interaction.followup.send.call_args.args[0]
+            assert "🔴 Unhealthy" in details
+            assert "**Database:** ✅ Connected" in details
+            assert "**GitHub API:** ❌ Error (0/1 tokens working)" in details
+    
+    @pytest.mark.asyncio
+    async def test_health_command_probes_every_pooled_token(self, mock_interaction):
+        """Test health command checks each token in the pool, not just the first."""
+        working, revoked = Mock(), Mock()
+        revoked.get_rate_limit.side_effect = Exception("Bad credentials")
+        
+        with patch('src.bot.github_clients', [working, revoked]), \
+             patch('src.bot.health_check', return_value=True), \
+             patch('src.bot.bot') as mock_bot:
+            mock_bot.user.name = "TestBot"
+            mock_bot.user.discriminator = "0001"
+            
+            from src.bot import health_command
+            
+            await health_command.callback(mock_interaction)
+            
+            working.get_rate_limit.assert_called_once_with()
+            revoked.get_rate_limit.assert_called_once_with()
+            details = mock_interaction.followup.send.call_args.args[0]
+            assert "🔴 Unhealthy" in details
+            assert "**GitHub API:** ❌ Error (1/2 tokens working)" in details
+    
+    @pytest.mark.asyncio
+    async def test_health_command_reports_inaccessible_repository(self, mock_interaction):
+        """Test health command flags a repository that can't be reached."""
+        from github import UnknownObjectException
+        
+        repo = Mock()
+        repo.update.side_effect = UnknownObjectException(404, {"message": "Not Found"}, {})
+        command_repo = Mock()
+        
+        with patch('src.bot.github_clients', [Mock()]), \
+             patch('src.bot.github_repos', [command_repo]), \
+             patch('src.bot.health_repo', repo), \
+             patch('src.bot.health_check', return_value=True), \
+             patch('src.bot.bot') as mock_bot:
+            mock_bot.user.name = "TestBot"
+            mock_bot.user.discriminator = "0001"
+            
+            from src.bot import health_command
+            
+            await health_command.callback(mock_interaction)
+            
+            repo.update.assert_called_once_with()
+            command_repo.update.assert_not_called()
+            details = mock_interaction.followup.send.call_args.args[0]
+            assert "🔴 Unhealthy" in details
+            assert "**GitHub API:** ✅ Connected (1/1 tokens working)" in details
+            assert "**Repository:** test_owner/test_repo ❌ Not found or no access" in details
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_bot(self, mock_env_vars):
+        """Test that a termination signal closes the Discord connection."""
+        import signal
+        
+        with patch('src.bot.bot') as mock_bot:
+            mock_bot.close = AsyncMock()
+            
+            from src.bot import shutdown
+            
+            await shutdown(signal.SIGTERM)
+            
+            mock_bot.close.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_signal_keeps_task_reference(self, mock_env_vars):
+        """Test that the scheduled shutdown task is referenced until it finishes."""
+        import signal
+        
+        with patch('src.bot.bot') as mock_bot:
+            mock_bot.close = AsyncMock()
+            
+            from src.bot import _schedule_shutdown, _shutdown_tasks
+            
+            _schedule_shutdown(asyncio.get_running_loop(), signal.SIGTERM)
+            assert len(_shutdown_tasks) == 1
+            
+            await asyncio.gather(*_shutdown_tasks)
+            await asyncio.sleep(0)
+            
+            mock_bot.close.assert_awaited_once()
+            assert not _shutdown_tasks
+
+
+class GitHubStub:
+    """Local HTTP server that replays scripted GitHub API responses."""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                stub.requests.append((self.command, self.path))
+                status, headers, body = stub.responses.pop(0)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            do_GET = do_POST = _respond
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+ISSUE_CREATED = (201, {}, {
+    "number": 1,
+    "html_url": "https://github.com/owner/repo/issues/1",
+    "url": "https://api.github.com/repos/owner/repo/issues/1",
+})
+
+
+class TestGitHubRateLimits:
+    """Rate-limit handling exercised through PyGithub's real Requester."""
+    
+    @pytest.fixture(autouse=True)
+    def mock_env_vars(self, monkeypatch):
+        """Mock environment variables so src.bot can be imported."""
+        monkeypatch.setenv("DISCORD_TOKEN", "test_token")
+        monkeypatch.setenv("GITHUB_TOKEN", "test_token")
+        monkeypatch.setenv("GITHUB_REPO_OWNER", "test_owner")
+        monkeypatch.setenv("GITHUB_REPO_NAME", "test_repo")
+    
+    @pytest.fixture
+    def github_stub(self):
+        """Start a stub server; tests set its responses before use."""
+        stub = GitHubStub([])
+        yield stub
+        stub.close()
+    
+    @pytest.fixture
+    def mock_sleep(self):
+        """Record rate-limit backoff instead of actually sleeping."""
+        with patch('src.bot.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            yield mock_sleep
+    
+    def make_repo(self, stub):
+        from src.bot import make_github
+        client = make_github("test_token", base_url=stub.url, seconds_between_writes=None)
+        return client, client.get_repo("owner/repo")
+    
+    @pytest.mark.asyncio
+    async def test_issue_creation_retries_after_429(self, github_stub, mock_sleep):
+        """Test that a 429 on issue creation is waited out and retried once."""
+        from src.bot import call_github
+        github_stub.responses = [
+            (429, {"Retry-After": "1"}, {"message": "Too Many Requests"}),
+            ISSUE_CREATED,
+        ]
+        _, repo = self.make_repo(github_stub)
+        
+        issue = await call_github(repo.create_issue, title="Test Issue")
+        
+        assert issue.number == 1
+        assert [method for method, _ in github_stub.requests] == ["POST", "POST"]
+        mock_sleep.assert_called_once_with(1.0)
+    
+    @pytest.mark.asyncio
+    async def test_issue_creation_retries_after_secondary_rate_limit(self, github_stub, mock_sleep):
+        """Test that a secondary-limit 403 on issue creation is waited out and retried."""
+        from src.bot import call_github
+        github_stub.responses = [
+            (403, {"Retry-After": "2"}, {"message": "You have exceeded a secondary rate limit."}),
+            ISSUE_CREATED,
+        ]
+        _, repo = self.make_repo(github_stub)
+        
+        issue = await call_github(repo.create_issue, title="Test Issue")
+        
+        assert issue.number == 1
+        assert len(github_stub.requests) == 2
+        mock_sleep.assert_called_once_with(2.0)
+    
+    @pytest.mark.asyncio
+    async def test_long_rate_limit_wait_fails_fast(self, github_stub, mock_sleep):
+        """Test that a primary limit resetting far in the future is raised, not slept on."""
+        from github import RateLimitExceededException
+        from src.bot import call_github
+        github_stub.responses = [
+            (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 3600)},
+             {"message": "API rate limit exceeded for user ID 1."}),
+        ]
+        client, _ = self.make_repo(github_stub)
+        
+        with pytest.raises(RateLimitExceededException):
+            await call_github(client.get_rate_limit)
+        
+        assert len(github_stub.requests) == 1
+        mock_sleep.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_issue_creation_not_resent_after_server_error(self, github_stub, mock_sleep):
+        """Test that a 5xx on issue creation is reported without resending the POST."""
+        from github import GithubException
+        from src.bot import call_github
+        github_stub.responses = [(502, {}, {"message": "Bad Gateway"}), ISSUE_CREATED]
+        _, repo = self.make_repo(github_stub)
+        
+        with pytest.raises(GithubException) as excinfo:
+            await call_github(repo.create_issue, title="Test Issue")
+        
+        assert excinfo.value.status == 502
+        assert len(github_stub.requests) == 1
+    
+    @pytest.mark.asyncio
+    async def test_idempotent_request_retried_after_server_error(self, github_stub, mock_sleep):
+        """Test that a 5xx on a GET is retried at the transport level."""
+        from src.bot import call_github
+        github_stub.responses = [
+            (502, {}, {"message": "Bad Gateway"}),
+            (200, {}, {"resources": {}, "rate": {"limit": 5000, "remaining": 4999, "reset": 0, "used": 1}}),
+        ]
+        client, _ = self.make_repo(github_stub)
+        
+        await call_github(client.get_rate_limit)
+        
+        assert [method for method, _ in github_stub.requests] == ["GET", "GET"]
+        mock_sleep.assert_not_called()
 
 
 class TestContainerFeatures:
@@ -200,6 +723,17 @@ class TestContainerFeatures:
                 path = get_database_path()
                 assert path == custom_path
     
+    def test_database_path_directory_created_once(self):
+        """Test that the database directory is only created on first lookup."""
+        import src.db.database
+        
+        with patch('src.db.database.DATABASE_PATH', "/cached/path/test.db"), \
+             patch('pathlib.Path.mkdir') as mock_mkdir:
+            src.db.database.get_database_path()
+            src.db.database.get_database_path()
+            
+            mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+    
     def test_environment_variable_validation(self):
         """Test that missing environment variables are detected."""
         # This would require importing the bot module which checks env vars